@@ -1,18 +1,22 @@
-from flask import Flask, request, jsonify
+from flask import Flask, current_app, request, jsonify
 from pathlib import Path
-import subprocess
+import os
+import threading
 
 from smart_picks import (
-    Config,
-    DEFAULT_CONFIG_PATH,
-    load_bet_history,
-    save_bet_history,
+    setup_logging,
+    load_config,
+    load_placed_bets,
+    save_placed_bets,
     apply_grade_to_bet,
+    rebuild_data_json,
 )
 
-app = Flask(__name__)
+# Serializes load -> grade -> save -> rebuild so concurrent requests on the
+# threaded server can't overwrite each other's placed_bets.json
+_grade_lock = threading.Lock()
+
 
-@app.post("/grade")
 def grade():
     data = request.get_json(force=True) or {}
     bet_id = data.get("bet_id")
@@ -20,25 +24,44 @@ def grade():
     if not bet_id or not outcome:
         return jsonify({"status": "error", "message": "bet_id and outcome required"}), 400
 
-    config = Config.load(DEFAULT_CONFIG_PATH)
-    history_rows = load_bet_history(config.bet_history_path)
+    with _grade_lock:
+        config = load_config()
+        bets = load_placed_bets()
+
+        if not apply_grade_to_bet(bets, bet_id, outcome):
+            return jsonify({"status": "error", "message": "could not grade bet"}), 400
+
+        save_placed_bets(bets)
 
-    if not apply_grade_to_bet(history_rows, bet_id, outcome, config.starting_bankroll):
-        return jsonify({"status": "error", "message": "could not grade bet"}), 400
+        # Rebuild data.json so UI sees changes (in-process, no interpreter restart).
+        # The grade is already saved, so a failed rebuild must not fail the request.
+        try:
+            rebuild_data_json(config)
+        except Exception:
+            current_app.logger.exception("Bet graded but data.json rebuild failed")
+            return jsonify({
+                "status": "ok",
+                "rebuilt": False,
+                "message": "bet graded, but data.json was not rebuilt",
+            }), 200
 
-    save_bet_history(history_rows, config.bet_history_path)
+    return jsonify({"status": "ok", "rebuilt": True}), 200
 
-    # Rebuild data.json so UI sees changes
-    subprocess.run(
-        ["python3", "smart_picks.py"],
-        cwd=Path(__file__).parent,
-        check=False,
-    )
 
-    return jsonify({"status": "ok"}), 200
+def create_app() -> Flask:
+    """
+    Build the grader app (found automatically by `flask --app grader_api run`)
+    smart_picks reads/writes its data files relative to the working directory,
+    so pin it to this folder and enable the pipeline's INFO logging here.
+    """
+    os.chdir(Path(__file__).parent)
+    setup_logging()
+
+    app = Flask(__name__)
+    app.post("/grade")(grade)
+    return app
 
 
 if __name__ == "__main__":
     # run with: python3 grader_api.py
-    app.run(host="127.0.0.1", port=5001, debug=True)
-
+    create_app().run(host="127.0.0.1", port=5001, debug=True)
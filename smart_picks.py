@@ -1,126 +1,34 @@
-# ============================================================================
-# PERFORMANCE TRACKING
-# ============================================================================
-
-def calculate_performance(picks: List[Pick]) -> Dict:
-    """Calculate performance metrics from graded picks"""
-    graded = [p for p in picks if p.status == 'graded' and p.result]
-    
-    if not graded:
-        return {
-            'overall': {
-                'total_bets': 0,
-                'wins': 0,
-                'losses': 0,
-                'pushes': 0,
-                'win_rate': 0.0,
-                'roi': 0.0,
-                'total_wagered': 0.0,
-                'total_profit': 0.0
-            },
-            'by_sport': {},
-            'by_bet_type': {}
-        }
-    
-    # Overall stats
-    wins = len([p for p in graded if p.result == 'WIN'])
-    losses = len([p for p in graded if p.result == 'LOSS'])
-    pushes = len([p for p in graded if p.result == 'PUSH'])
-    total_wagered = sum(p.stake for p in graded)
-    total_profit = sum(p.profit for p in graded if p.profit is not None)
-    
-    # Calculate win rate (excluding pushes)
-    decisive_bets = wins + losses
-    win_rate = wins / decisive_bets if decisive_bets > 0 else 0.0
-    
-    # Calculate ROI
-    roi = (total_profit / total_wagered) if total_wagered > 0 else 0.0
-    
-    overall = {
-        'total_bets': len(graded),
-        'wins': wins,
-        'losses': losses,
-        'pushes': pushes,
-        'win_rate': round(win_rate, 3),
-        'roi': round(roi, 3),
-        'total_wagered': round(total_wagered, 2),
-        'total_profit': round(total_profit, 2)
-    }
-    
-    # By sport
-    by_sport = {}
-    for sport in set(p.sport for p in graded):
-        sport_picks = [p for p in graded if p.sport == sport]
-        sport_wins = len([p for p in sport_picks if p.result == 'WIN'])
-        sport_losses = len([p for p in sport_picks if p.result == 'LOSS'])
-        sport_decisive = sport_wins + sport_losses
-        sport_wagered = sum(p.stake for p in sport_picks)
-        sport_profit = sum(p.profit for p in sport_picks if p.profit is not None)
-        
-        by_sport[sport] = {
-            'bets': len(sport_picks),
-            'wins': sport_wins,
-            'losses': sport_losses,
-            'win_rate': round(sport_wins / sport_decisive, 3) if sport_decisive > 0 else 0.0,
-            'roi': round(sport_profit / sport_wagered, 3) if sport_wagered > 0 else 0.0,
-            'profit': round(sport_profit, 2)
-        }
-    
-    # By bet type
-    by_bet_type = {}
-    for bet_type in set(p.pick_type for p in graded):
-        type_picks = [p for p in graded if p.pick_type == bet_type]
-        type_wins = len([p for p in type_picks if p.result == 'WIN'])
-        type_losses = len([p for p in type_picks if p.result == 'LOSS'])
-        type_decisive = type_wins + type_losses
-        type_wagered = sum(p.stake for p in type_picks)
-        type_profit = sum(p.profit for p in type_picks if p.profit is not None)
-        
-        bet_type_name = {'h2h': 'Moneyline', 'spreads': 'Spread', 'totals': 'Total'}.get(bet_type, bet_type)
-        
-        by_bet_type[bet_type_name] = {
-            'bets': len(type_picks),
-            'wins': type_wins,
-            'losses': type_losses,
-            'win_rate': round(type_wins / type_decisive, 3) if type_decisive > 0 else 0.0,
-            'roi': round(type_profit / type_wagered, 3) if type_wagered > 0 else 0.0,
-            'profit': round(type_profit, 2)
-        }
-    
-    return {
-        'overall': overall,
-        'by_sport': by_sport,
-        'by_bet_type': by_bet_type
-    }
-
-def save_performance(performance: Dict):
-    """Save performance metrics to JSON file"""
-    data = {
-        'last_updated': datetime.now().isoformat(),
-        'performance': performance
-    }
-    
-    try:
-        with open(PERFORMANCE_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
-        logger.info(f"✓ Saved performance metrics to {PERFORMANCE_FILE}")
-    except Exception as e:
-        logger.error(f"Error saving performance: {e}")#!/usr/bin/env python3
+#!/usr/bin/env python3
 """
 SmartPicks - Sports Betting Analytics Engine
 Fetches odds, calculates EV, generates picks, grades results
 """
 
+import os
 import json
 import csv
+import heapq
 import requests
 import time
+import tempfile
 import argparse
 import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from itertools import groupby
+from operator import attrgetter
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # ============================================================================
 # CONFIGURATION
@@ -131,7 +39,14 @@ DATA_OUTPUT = "data.json"
 SCORES_OUTPUT = "scores.json"
 PLACED_BETS_FILE = "placed_bets.json"
 PERFORMANCE_FILE = "performance.json"
+SCORES_CACHE_FILE = ".scores_cache.json"
+SCORES_CACHE_TTL = 300  # Seconds cached scores are reused without asking the API
+ODDS_CACHE_FILE = ".odds_cache.json"
+ODDS_CACHE_TTL = 60  # Seconds cached odds are reused without asking the API
 MAX_PICKS = 15  # Maximum picks to auto-place
+OPEN_OR_PENDING = frozenset({'open', 'pending'})  # Statuses of bets still awaiting a result
+HTTP_POOL_SIZE = 16  # Max pooled connections / concurrent API requests
+HTTP_RETRIES = 2  # Retries after the first attempt for transient API failures
 
 # Sport mappings
 SPORT_KEYS = {
@@ -143,6 +58,16 @@ SPORT_KEYS = {
     "ufc": "mma_mixed_martial_arts"
 }
 
+# Reverse of SPORT_KEYS: API sport key -> short name
+SPORT_SHORT_NAMES = {key: short for short, key in SPORT_KEYS.items()}
+
+# Pick.sport label (e.g. 'NBA') -> API sport key
+SPORT_LABEL_TO_KEY = {short.upper(): key for short, key in SPORT_KEYS.items()}
+
+# Order of sport sections in data.json pick_cards
+SPORT_DISPLAY_ORDER = ['NBA', 'NFL', 'NHL', 'EPL', 'UEFA', 'UFC']
+SPORT_DISPLAY_RANK = {sport: rank for rank, sport in enumerate(SPORT_DISPLAY_ORDER)}
+
 SPORT_NAMES = {
     "basketball_nba": "NBA",
     "americanfootball_nfl": "NFL",
@@ -167,7 +92,7 @@ class Config:
     parlay_legs: int
     sports: List[str]
 
-@dataclass
+@dataclass(slots=True)
 class Pick:
     sport: str
     event_id: str
@@ -186,6 +111,8 @@ class Pick:
     result: Optional[str] = None  # 'WIN', 'LOSS', 'PUSH'
     profit: Optional[float] = None
 
+PICK_FIELDS = tuple(f.name for f in fields(Pick))
+
 # ============================================================================
 # LOGGING SETUP
 # ============================================================================
@@ -200,6 +127,79 @@ def setup_logging(debug: bool = False):
     )
     return logging.getLogger(__name__)
 
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# JSON I/O
+# ============================================================================
+
+def read_json(path) -> Dict:
+    """Read a JSON file, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def write_json(path, payload: Dict, indent: bool = True):
+    """Write a JSON file atomically, using orjson when it is installed
+    
+    Files read by people (and diffed in git) get a 2-space indent; pass
+    indent=False for machine-only files to skip the pretty-printing cost.
+    The payload is written to a temp file and renamed over the target, so
+    readers (and the next run) never see a truncated file.
+    """
+    if orjson is not None:
+        data = orjson.dumps(payload, option=orjson.OPT_INDENT_2 if indent else 0)
+    elif indent:
+        data = json.dumps(payload, indent=2).encode()
+    else:
+        data = json.dumps(payload, separators=(',', ':')).encode()
+    
+    # A unique temp file per call, so concurrent writers (e.g. threaded
+    # grader API requests) never share or publish each other's temp file
+    fd, tmp_path = tempfile.mkstemp(dir=Path(path).parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file 0600; keep the target readable by the site
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def load_disk_cache(path) -> Dict[str, Dict]:
+    """Load an on-disk API cache (sport_key -> entry); missing or corrupt files count as empty"""
+    try:
+        entries = read_json(path)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable cache {path}: {e}")
+        return {}
+    
+    if not isinstance(entries, dict):
+        logger.warning(f"Ignoring malformed cache {path}: expected an object")
+        return {}
+    # Drop any per-sport entry that isn't an object as well
+    return {key: entry for key, entry in entries.items() if isinstance(entry, dict)}
+
+def save_disk_cache(path, entries: Dict[str, Dict]):
+    """Save an on-disk API cache; failures only cost a refetch next run"""
+    try:
+        write_json(path, entries, indent=False)
+    except Exception as e:
+        logger.warning(f"Error saving cache {path}: {e}")
+
 # ============================================================================
 # CONFIGURATION LOADER
 # ============================================================================
@@ -207,8 +207,7 @@ def setup_logging(debug: bool = False):
 def load_config() -> Config:
     """Load configuration from config.json"""
     try:
-        with open(CONFIG_FILE, 'r') as f:
-            data = json.load(f)
+        data = read_json(CONFIG_FILE)
         
         # Support both lowercase and legacy UPPERCASE keys for backward compatibility
         api_key = data.get('api_key', '')
@@ -268,9 +267,30 @@ def load_config() -> Config:
 # ODDS API INTEGRATION
 # ============================================================================
 
-def fetch_odds(sport_key: str, api_key: str, retries: int = 3) -> Optional[List[Dict]]:
+def create_session() -> requests.Session:
     """
-    Fetch odds from The Odds API with retry logic
+    Create an HTTP session that keeps TLS connections to the API alive
+    and retries transient failures (connection errors, 429 and 5xx)
+    """
+    retry = Retry(
+        total=HTTP_RETRIES,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504]
+    )
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_SIZE,
+        pool_maxsize=HTTP_POOL_SIZE,
+        max_retries=retry
+    )
+    session.mount('https://', adapter)
+    return session
+
+SESSION = create_session()
+
+def fetch_odds(sport_key: str, api_key: str) -> Optional[List[Dict]]:
+    """
+    Fetch odds from The Odds API (retries are handled by the session adapter)
     """
     base_url = "https://api.the-odds-api.com/v4/sports"
     url = f"{base_url}/{sport_key}/odds/"
@@ -282,60 +302,119 @@ def fetch_odds(sport_key: str, api_key: str, retries: int = 3) -> Optional[List[
         'oddsFormat': 'american'
     }
     
-    for attempt in range(retries):
-        try:
-            logger.debug(f"Fetching {sport_key} (attempt {attempt + 1}/{retries})")
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            logger.info(f"✓ Fetched {len(data)} events for {SPORT_NAMES.get(sport_key, sport_key)}")
-            return data
+    try:
+        logger.debug(f"Fetching {sport_key}")
+        response = SESSION.get(url, params=params, timeout=10)
+        response.raise_for_status()
         
-        except requests.exceptions.RequestException as e:
-            logger.warning(f"API request failed for {sport_key}: {e}")
-            if attempt < retries - 1:
-                wait_time = 2 ** attempt
-                logger.debug(f"Retrying in {wait_time}s...")
-                time.sleep(wait_time)
-            else:
-                logger.error(f"✗ Failed to fetch {sport_key} after {retries} attempts")
-                return None
+        data = response.json()
+        logger.info(f"✓ Fetched {len(data)} events for {SPORT_NAMES.get(sport_key, sport_key)}")
+        return data
+    
+    except requests.exceptions.RequestException as e:
+        logger.error(f"✗ Failed to fetch {sport_key}: {e}")
+        return None
+
+def fetch_sport_odds(sport_key: str, config: Config) -> Optional[List[Dict]]:
+    """Fetch odds for one sport, falling back to the backup API key"""
+    odds = fetch_odds(sport_key, config.api_key)
+    
+    # Try backup API key if primary fails
+    if odds is None and config.backup_api_key:
+        logger.info(f"Trying backup API key for {sport_key}")
+        odds = fetch_odds(sport_key, config.backup_api_key)
+    
+    return odds
+
+def fetch_for_sports(sport_keys: List[str], fetch) -> Dict[str, List[Dict]]:
+    """
+    Call fetch(sport_key) for every sport concurrently
+    Returns non-empty results keyed by sport, in sport_keys order
+    """
+    results = {}
+    if not sport_keys:
+        return results
+    
+    workers = min(len(sport_keys), HTTP_POOL_SIZE)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for sport_key, data in zip(sport_keys, executor.map(fetch, sport_keys)):
+            if data:
+                results[sport_key] = data
+    
+    return results
 
 def fetch_all_odds(config: Config) -> Dict[str, List[Dict]]:
-    """Fetch odds for all configured sports"""
-    all_odds = {}
+    """
+    Fetch odds for all configured sports concurrently
+    Odds younger than ODDS_CACHE_TTL are read from ODDS_CACHE_FILE
+    without a request, so back-to-back rebuilds (e.g. from the grader
+    API) do not spend quota on unchanged odds.
+    """
+    disk_cache = load_disk_cache(ODDS_CACHE_FILE)
+    now = time.time()
     
+    odds = {}
+    stale = []
     for sport_key in config.sports:
-        odds = fetch_odds(sport_key, config.api_key)
-        
-        # Try backup API key if primary fails
-        if odds is None and config.backup_api_key:
-            logger.info(f"Trying backup API key for {sport_key}")
-            odds = fetch_odds(sport_key, config.backup_api_key)
-        
-        if odds:
-            all_odds[sport_key] = odds
+        entry = disk_cache.get(sport_key)
+        if entry and 'odds' in entry and now - entry.get('fetched_at', 0) < ODDS_CACHE_TTL:
+            odds[sport_key] = entry['odds']
+        else:
+            stale.append(sport_key)
     
-    return all_odds
+    if odds:
+        logger.info(f"Using cached odds for {len(odds)} sports")
+    
+    fetched = fetch_for_sports(stale, lambda sport_key: fetch_sport_odds(sport_key, config))
+    for sport_key, data in fetched.items():
+        odds[sport_key] = data
+        disk_cache[sport_key] = {'fetched_at': now, 'odds': data}
+    
+    if fetched:
+        save_disk_cache(ODDS_CACHE_FILE, disk_cache)
+    
+    # Keep results in configured sport order, empty sports dropped
+    return {sport_key: odds[sport_key] for sport_key in config.sports if odds.get(sport_key)}
 
 # ============================================================================
 # PROBABILITY & EV CALCULATIONS
 # ============================================================================
 
-def american_to_prob(odds: int) -> float:
-    """Convert American odds to implied probability"""
+def _implied_prob(odds: int) -> float:
+    """Implied probability formula for American odds"""
     if odds > 0:
         return 100 / (odds + 100)
     else:
         return abs(odds) / (abs(odds) + 100)
 
-def calculate_fair_prob(odds: int, vig_removal: float = 0.05) -> float:
+# Prices repeat heavily across events, so the practical range is precomputed
+IMPLIED_PROB_TABLE = {odds: _implied_prob(odds) for odds in range(-2000, 2001)}
+
+def american_to_prob(odds: int) -> float:
+    """Convert American odds to implied probability"""
+    prob = IMPLIED_PROB_TABLE.get(odds)
+    return prob if prob is not None else _implied_prob(odds)
+
+def _payout_multiplier(odds: int) -> float:
+    """Profit per unit staked on a win at American odds"""
+    if odds > 0:
+        return odds / 100
+    else:
+        return 100 / abs(odds)
+
+# Same odds range as IMPLIED_PROB_TABLE (0 is not a valid price)
+PAYOUT_TABLE = {odds: _payout_multiplier(odds) for odds in range(-2000, 2001) if odds != 0}
+
+def payout_multiplier(odds: int) -> float:
+    """Profit per unit staked on a win at American odds"""
+    multiplier = PAYOUT_TABLE.get(odds)
+    return multiplier if multiplier is not None else _payout_multiplier(odds)
+
+def fair_prob_from_market(market_prob: float, vig_removal: float = 0.05) -> float:
     """
-    Calculate fair probability with vig removal
+    Calculate fair probability with vig removal from a market probability
     Simple method: boost implied prob by ~5% to remove bookmaker edge
     """
-    market_prob = american_to_prob(odds)
     fair_prob = market_prob * (1 + vig_removal)
     return min(fair_prob, 0.99)  # Cap at 99%
 
@@ -344,12 +423,7 @@ def calculate_ev(fair_prob: float, odds: int, stake: float) -> float:
     Calculate Expected Value
     EV = (fair_prob × payout) - (loss_prob × stake)
     """
-    market_prob = american_to_prob(odds)
-    
-    if odds > 0:
-        payout = stake * (odds / 100)
-    else:
-        payout = stake * (100 / abs(odds))
+    payout = stake * payout_multiplier(odds)
     
     ev = (fair_prob * payout) - ((1 - fair_prob) * stake)
     return ev
@@ -389,10 +463,15 @@ def calculate_smart_score(ev: float, fair_prob: float, market_prob: float,
 # PICK GENERATION
 # ============================================================================
 
-def generate_picks(odds_data: Dict[str, List[Dict]], config: Config) -> List[Pick]:
-    """Generate all candidate picks from odds data"""
+def generate_picks(odds_data: Dict[str, List[Dict]], config: Config,
+                   skip_event_ids: Optional[set] = None) -> List[Pick]:
+    """
+    Generate all candidate picks from odds data
+    Events in skip_event_ids (games we already hold a bet on) are not scored
+    """
     picks = []
     stake = config.base_bankroll * config.unit_fraction
+    skip_event_ids = skip_event_ids or set()
     
     for sport_key, events in odds_data.items():
         sport_short = get_sport_short_name(sport_key)
@@ -401,6 +480,9 @@ def generate_picks(odds_data: Dict[str, List[Dict]], config: Config) -> List[Pic
         logger.debug(f"Processing {len(events)} events for {sport_short}")
         
         for event in events:
+            if event.get('id', '') in skip_event_ids:
+                continue
+            
             event_picks = extract_picks_from_event(
                 event, sport_key, sport_short, stake, threshold
             )
@@ -411,15 +493,7 @@ def generate_picks(odds_data: Dict[str, List[Dict]], config: Config) -> List[Pic
 
 def get_sport_short_name(sport_key: str) -> str:
     """Convert API sport key to short name"""
-    mapping = {
-        'basketball_nba': 'nba',
-        'americanfootball_nfl': 'nfl',
-        'icehockey_nhl': 'nhl',
-        'soccer_epl': 'epl',
-        'soccer_uefa_champions_league': 'uefa',
-        'mma_mixed_martial_arts': 'ufc'
-    }
-    return mapping.get(sport_key, sport_key)
+    return SPORT_SHORT_NAMES.get(sport_key, sport_key)
 
 def extract_picks_from_event(event: Dict, sport_key: str, sport_short: str, 
                              stake: float, threshold: Optional[float]) -> List[Pick]:
@@ -439,12 +513,16 @@ def extract_picks_from_event(event: Dict, sport_key: str, sport_short: str,
     book = bookmakers[0]
     markets = book.get('markets', [])
     
+    # Per-event invariants, bound once rather than per outcome
+    sport_label = sport_short.upper()
+    moneyline_only = sport_short == 'ufc'
+    
     for market in markets:
         market_key = market.get('key', '')
         outcomes = market.get('outcomes', [])
         
         # UFC: Moneyline only
-        if sport_short == 'ufc' and market_key != 'h2h':
+        if moneyline_only and market_key != 'h2h':
             continue
         
         for outcome in outcomes:
@@ -455,10 +533,15 @@ def extract_picks_from_event(event: Dict, sport_key: str, sport_short: str,
             if odds == 0:
                 continue
             
-            # Calculate probabilities and EV
-            fair_prob = calculate_fair_prob(odds)
+            # Calculate probabilities and EV (convert the odds only once)
             market_prob = american_to_prob(odds)
+            fair_prob = fair_prob_from_market(market_prob)
             ev = calculate_ev(fair_prob, odds, stake)
+            
+            # Only positive EV picks (checked before scoring, which is wasted otherwise)
+            if ev <= 0:
+                continue
+            
             smart_score = calculate_smart_score(
                 ev, fair_prob, market_prob, odds, sport_key
             )
@@ -467,10 +550,6 @@ def extract_picks_from_event(event: Dict, sport_key: str, sport_short: str,
             if threshold is not None and smart_score < threshold:
                 continue
             
-            # Only positive EV picks
-            if ev <= 0:
-                continue
-            
             # Format pick name with point if applicable
             if point is not None:
                 if market_key == 'spreads':
@@ -483,7 +562,7 @@ def extract_picks_from_event(event: Dict, sport_key: str, sport_short: str,
                 pick_display = pick_name
             
             pick = Pick(
-                sport=sport_short.upper(),
+                sport=sport_label,
                 event_id=event_id,
                 commence_time=commence_time,
                 home_team=home_team,
@@ -512,49 +591,39 @@ def deduplicate_picks(picks: List[Pick]) -> List[Pick]:
     Remove duplicate picks for the same event
     Also prevents betting both sides (e.g., Lakers -5 AND Warriors +5)
     """
-    seen_events = {}  # event_id -> pick
-    unique_picks = []
+    seen_events = {}  # event_id -> best pick, in result order
+    debug = logger.isEnabledFor(logging.DEBUG)
     
     for pick in picks:
         event_id = pick.event_id
+        existing_pick = seen_events.get(event_id)
         
-        # Check if we already have a pick for this event
-        if event_id in seen_events:
-            existing_pick = seen_events[event_id]
-            
-            # Keep the pick with higher EV
-            if pick.ev > existing_pick.ev:
-                # Remove old pick, add new one
-                unique_picks.remove(existing_pick)
-                seen_events[event_id] = pick
-                unique_picks.append(pick)
-                logger.debug(f"Replaced pick for {event_id}: {existing_pick.pick} → {pick.pick}")
-        else:
+        if existing_pick is None:
             # First pick for this event
             seen_events[event_id] = pick
-            unique_picks.append(pick)
+        elif pick.ev > existing_pick.ev:
+            # Keep the pick with higher EV; re-insert so it moves to the end
+            # of the result, as a remove + append would
+            del seen_events[event_id]
+            seen_events[event_id] = pick
+            if debug:
+                logger.debug(f"Replaced pick for {event_id}: {existing_pick.pick} → {pick.pick}")
     
+    unique_picks = list(seen_events.values())
     logger.info(f"✓ Deduplicated: {len(picks)} → {len(unique_picks)} picks (no duplicate games)")
     return unique_picks
 
 def sort_picks_by_sport(picks: List[Pick]) -> Dict[str, List[Pick]]:
-    """Organize picks by sport"""
-    by_sport = {
-        'NBA': [],
-        'NFL': [],
-        'NHL': [],
-        'EPL': [],
-        'UEFA': [],
-        'UFC': []
-    }
-    
-    for pick in picks:
-        if pick.sport in by_sport:
-            by_sport[pick.sport].append(pick)
+    """Organize picks by sport (display order), each sport sorted by EV descending"""
+    by_sport = {sport: [] for sport in SPORT_DISPLAY_ORDER}
     
-    # Sort each sport by EV descending
-    for sport in by_sport:
-        by_sport[sport].sort(key=lambda p: p.ev, reverse=True)
+    # One sort on (sport rank, -EV), then slice out each sport's run
+    ranked = sorted(
+        (p for p in picks if p.sport in SPORT_DISPLAY_RANK),
+        key=lambda p: (SPORT_DISPLAY_RANK[p.sport], -p.ev)
+    )
+    for sport, group in groupby(ranked, key=attrgetter('sport')):
+        by_sport[sport] = list(group)
     
     return by_sport
 
@@ -564,11 +633,8 @@ def sort_picks_by_sport(picks: List[Pick]) -> Dict[str, List[Pick]]:
 
 def build_parlay(picks: List[Pick], num_legs: int = 5) -> List[Pick]:
     """Build top N EV parlay from all picks"""
-    # Sort all picks by EV globally
-    sorted_picks = sorted(picks, key=lambda p: p.ev, reverse=True)
-    
-    # Take top N
-    parlay = sorted_picks[:num_legs]
+    # Select the top N by EV without sorting the whole list
+    parlay = heapq.nlargest(num_legs, picks, key=attrgetter('ev'))
     
     logger.info(f"✓ Built {len(parlay)}-leg parlay (Total EV: ${sum(p.ev for p in parlay):.2f})")
     return parlay
@@ -577,8 +643,14 @@ def build_parlay(picks: List[Pick], num_legs: int = 5) -> List[Pick]:
 # GRADING ENGINE
 # ============================================================================
 
-def fetch_scores(sport_key: str, api_key: str) -> Optional[List[Dict]]:
-    """Fetch scores from Odds API"""
+def fetch_scores_entry(sport_key: str, api_key: str,
+                       cached: Optional[Dict] = None) -> Optional[Dict]:
+    """
+    Fetch scores from Odds API as a cache entry
+    (scores + fetched_at + ETag/Last-Modified validators)
+    If a cached entry is given, the request is conditional and a
+    304 Not Modified reuses the cached scores
+    """
     base_url = "https://api.the-odds-api.com/v4/sports"
     url = f"{base_url}/{sport_key}/scores/"
     
@@ -587,24 +659,89 @@ def fetch_scores(sport_key: str, api_key: str) -> Optional[List[Dict]]:
         'daysFrom': 1
     }
     
+    headers = {}
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+    
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = SESSION.get(url, params=params, headers=headers, timeout=10)
         response.raise_for_status()
-        return response.json()
+        
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        
+        if response.status_code == 304 and cached:
+            logger.debug(f"Scores for {sport_key} not modified, using cached copy")
+            scores = cached['scores']
+            # A 304 may omit the validators; keep the cached ones for the next request
+            etag = etag or cached.get('etag')
+            last_modified = last_modified or cached.get('last_modified')
+        else:
+            scores = response.json()
+        
+        return {
+            'fetched_at': time.time(),
+            'etag': etag,
+            'last_modified': last_modified,
+            'scores': scores
+        }
     except Exception as e:
         logger.warning(f"Failed to fetch scores for {sport_key}: {e}")
         return None
 
-def grade_picks(picks: List[Pick], config: Config) -> List[Pick]:
+def fetch_all_scores(config: Config, cache: Optional[Dict[str, List[Dict]]] = None) -> Dict[str, List[Dict]]:
+    """
+    Fetch scores for all configured sports concurrently
+    Results are memoized in cache (one dict per run), so grading and
+    scores.json generation share a single request per sport.
+    Across runs, scores younger than SCORES_CACHE_TTL are read from
+    SCORES_CACHE_FILE without a request; older ones are revalidated.
+    """
+    if cache is None:
+        cache = {}
+    
+    missing = [sport_key for sport_key in config.sports if sport_key not in cache]
+    if missing:
+        disk_cache = load_disk_cache(SCORES_CACHE_FILE)
+        now = time.time()
+        
+        stale = []
+        for sport_key in missing:
+            entry = disk_cache.get(sport_key)
+            if entry and 'scores' in entry and now - entry.get('fetched_at', 0) < SCORES_CACHE_TTL:
+                cache[sport_key] = entry['scores']
+            else:
+                stale.append(sport_key)
+        
+        fetched = fetch_for_sports(
+            stale,
+            lambda sport_key: fetch_scores_entry(sport_key, config.api_key, disk_cache.get(sport_key))
+        )
+        for sport_key, entry in fetched.items():
+            cache[sport_key] = entry['scores']
+            disk_cache[sport_key] = entry
+        
+        if fetched:
+            save_disk_cache(SCORES_CACHE_FILE, disk_cache)
+    
+    return {sport_key: cache[sport_key] for sport_key in config.sports if cache.get(sport_key)}
+
+def grade_picks(picks: List[Pick], config: Config,
+                scores_cache: Optional[Dict[str, List[Dict]]] = None) -> List[Pick]:
     """Grade completed picks and update results"""
     graded = []
-    
-    # Fetch scores for all sports
-    all_scores = {}
-    for sport_key in config.sports:
-        scores = fetch_scores(sport_key, config.api_key)
-        if scores:
-            all_scores[sport_key] = {s.get('id'): s for s in scores}
+    results = Counter()
+    net_profit = 0.0
+    debug = logger.isEnabledFor(logging.DEBUG)
+    
+    # Fetch scores for all sports (shared with scores.json via scores_cache)
+    all_scores = {
+        sport_key: {s.get('id'): s for s in scores}
+        for sport_key, scores in fetch_all_scores(config, scores_cache).items()
+    }
     
     for pick in picks:
         # Skip already graded picks
@@ -612,13 +749,13 @@ def grade_picks(picks: List[Pick], config: Config) -> List[Pick]:
             graded.append(pick)
             continue
         
-        # Find matching score
-        sport_key = SPORT_KEYS.get(pick.sport.lower())
-        if not sport_key or sport_key not in all_scores:
+        # Find matching score (one lookup per level, bound to locals)
+        sport_scores = all_scores.get(SPORT_LABEL_TO_KEY.get(pick.sport))
+        if not sport_scores:
             graded.append(pick)
             continue
         
-        event_score = all_scores[sport_key].get(pick.event_id)
+        event_score = sport_scores.get(pick.event_id)
         if not event_score:
             graded.append(pick)
             continue
@@ -631,37 +768,67 @@ def grade_picks(picks: List[Pick], config: Config) -> List[Pick]:
         
         # Grade the pick
         result = determine_result(pick, event_score)
-        pick.result = result
-        pick.status = 'graded'
-        
-        # Calculate profit
-        if result == 'WIN':
-            if pick.odds > 0:
-                pick.profit = pick.stake * (pick.odds / 100)
-            else:
-                pick.profit = pick.stake * (100 / abs(pick.odds))
-        elif result == 'LOSS':
-            pick.profit = -pick.stake
-        else:  # PUSH
-            pick.profit = 0
+        settle_pick(pick, result)
+        results[result] += 1
+        net_profit += pick.profit
         
         graded.append(pick)
-        logger.info(f"✓ Graded: {pick.sport} {pick.pick} = {result} (${pick.profit:+.2f})")
+        if debug:
+            logger.debug(f"Graded: {pick.sport} {pick.pick} = {result} (${pick.profit:+.2f})")
     
+    if results:
+        logger.info(f"✓ Graded {sum(results.values())} picks: "
+                    f"{results['WIN']}W/{results['LOSS']}L/{results['PUSH']}P, net ${net_profit:+.2f}")
     return graded
 
+def settle_pick(pick: Pick, result: str):
+    """Mark a pick graded with the given result and compute its profit"""
+    pick.result = result
+    pick.status = 'graded'
+    
+    if result == 'WIN':
+        pick.profit = pick.stake * payout_multiplier(pick.odds)
+    elif result == 'LOSS':
+        pick.profit = -pick.stake
+    else:  # PUSH
+        pick.profit = 0
+
+@lru_cache(maxsize=1024)
+def parse_pick_line(text: str) -> Optional[Tuple[str, float]]:
+    """Split a spread/total pick like "Team Name +5.5" or "Over 215.5" into (label, line).
+    
+    Pending picks are regraded on every run, so the parse is memoized per string.
+    Returns None when the text has no numeric line.
+    """
+    parts = text.rsplit(' ', 1)
+    if len(parts) != 2:
+        return None
+    try:
+        return parts[0], float(parts[1])
+    except ValueError:
+        return None
+
 def determine_result(pick: Pick, score_data: Dict) -> str:
     """Determine if pick won, lost, or pushed with full spread/total support"""
     scores = score_data.get('scores', [])
     if len(scores) < 2:
         return 'PUSH'
     
-    home_score = next((s['score'] for s in scores if s['name'] == pick.home_team), None)
-    away_score = next((s['score'] for s in scores if s['name'] == pick.away_team), None)
+    team_scores = get_team_scores(score_data)
+    home_score = team_scores.get(pick.home_team)
+    away_score = team_scores.get(pick.away_team)
     
     if home_score is None or away_score is None:
         return 'PUSH'
     
+    # The scores endpoint reports scores as strings (e.g. "106")
+    try:
+        home_score = float(home_score)
+        away_score = float(away_score)
+    except (TypeError, ValueError):
+        logger.warning(f"Non-numeric score for {pick.away_team} @ {pick.home_team}")
+        return 'PUSH'
+    
     # H2H (Moneyline) - Team must win outright
     if pick.pick_type == 'h2h':
         # Extract team name from pick (in case it has spread notation)
@@ -674,51 +841,42 @@ def determine_result(pick: Pick, score_data: Dict) -> str:
     
     # Spreads - Extract point value and determine cover
     elif pick.pick_type == 'spreads':
-        try:
-            # Parse "Team Name +5.5" or "Team Name -3.0"
-            parts = pick.pick.rsplit(' ', 1)
-            if len(parts) != 2:
-                logger.warning(f"Could not parse spread pick: {pick.pick}")
-                return 'PUSH'
-            
-            team_name = parts[0]
-            spread = float(parts[1])
-            
-            # Determine which team we picked
-            if team_name == pick.home_team:
-                # Home team with spread
-                adjusted_score = home_score + spread
-                return 'WIN' if adjusted_score > away_score else 'LOSS' if adjusted_score < away_score else 'PUSH'
-            else:
-                # Away team with spread
-                adjusted_score = away_score + spread
-                return 'WIN' if adjusted_score > home_score else 'LOSS' if adjusted_score < home_score else 'PUSH'
-        except (ValueError, IndexError) as e:
-            logger.error(f"Error parsing spread for {pick.pick}: {e}")
+        # Parse "Team Name +5.5" or "Team Name -3.0"
+        parsed = parse_pick_line(pick.pick)
+        if parsed is None:
+            logger.warning(f"Could not parse spread pick: {pick.pick}")
             return 'PUSH'
+        
+        team_name, spread = parsed
+        
+        # Determine which team we picked
+        if team_name == pick.home_team:
+            # Home team with spread
+            adjusted_score = home_score + spread
+            return 'WIN' if adjusted_score > away_score else 'LOSS' if adjusted_score < away_score else 'PUSH'
+        else:
+            # Away team with spread
+            adjusted_score = away_score + spread
+            return 'WIN' if adjusted_score > home_score else 'LOSS' if adjusted_score < home_score else 'PUSH'
     
     # Totals - Extract total value and determine over/under
     elif pick.pick_type == 'totals':
-        try:
-            # Parse "Over 215.5" or "Under 48.0"
-            parts = pick.pick.rsplit(' ', 1)
-            if len(parts) != 2:
-                logger.warning(f"Could not parse total pick: {pick.pick}")
-                return 'PUSH'
-            
-            over_under = parts[0].upper()
-            total_line = float(parts[1])
-            actual_total = home_score + away_score
-            
-            if over_under == 'OVER':
-                return 'WIN' if actual_total > total_line else 'LOSS' if actual_total < total_line else 'PUSH'
-            elif over_under == 'UNDER':
-                return 'WIN' if actual_total < total_line else 'LOSS' if actual_total > total_line else 'PUSH'
-            else:
-                logger.warning(f"Unknown total type: {over_under}")
-                return 'PUSH'
-        except (ValueError, IndexError) as e:
-            logger.error(f"Error parsing total for {pick.pick}: {e}")
+        # Parse "Over 215.5" or "Under 48.0"
+        parsed = parse_pick_line(pick.pick)
+        if parsed is None:
+            logger.warning(f"Could not parse total pick: {pick.pick}")
+            return 'PUSH'
+        
+        over_under, total_line = parsed
+        over_under = over_under.upper()
+        actual_total = home_score + away_score
+        
+        if over_under == 'OVER':
+            return 'WIN' if actual_total > total_line else 'LOSS' if actual_total < total_line else 'PUSH'
+        elif over_under == 'UNDER':
+            return 'WIN' if actual_total < total_line else 'LOSS' if actual_total > total_line else 'PUSH'
+        else:
+            logger.warning(f"Unknown total type: {over_under}")
             return 'PUSH'
     
     return 'PUSH'
@@ -734,8 +892,7 @@ def load_placed_bets() -> List[Pick]:
         return []
     
     try:
-        with open(PLACED_BETS_FILE, 'r') as f:
-            data = json.load(f)
+        data = read_json(PLACED_BETS_FILE)
         
         picks = []
         for bet_data in data.get('bets', []):
@@ -766,41 +923,76 @@ def load_placed_bets() -> List[Pick]:
         logger.error(f"Error loading placed bets: {e}")
         return []
 
+def pick_to_record(pick: Pick) -> Dict:
+    """Flat field projection of a Pick for placed_bets.json (no deep copy, unlike asdict)"""
+    return {name: getattr(pick, name) for name in PICK_FIELDS}
+
 def save_placed_bets(picks: List[Pick]):
     """Save placed bets to JSON file"""
     data = {
         'last_updated': datetime.now().isoformat(),
-        'bets': [asdict(pick) for pick in picks]
+        'bets': [pick_to_record(pick) for pick in picks]
     }
     
     try:
-        with open(PLACED_BETS_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        write_json(PLACED_BETS_FILE, data)
         logger.info(f"✓ Saved {len(picks)} placed bets to {PLACED_BETS_FILE}")
     except Exception as e:
         logger.error(f"Error saving placed bets: {e}")
 
-def auto_place_picks(new_picks: List[Pick], existing_bets: List[Pick]) -> List[Pick]:
+def apply_grade_to_bet(bets: List[Pick], bet_id: str, outcome: str) -> bool:
+    """
+    Manually grade an open/pending bet, identified by its event_id
+    Outcome is 'WIN', 'LOSS' or 'PUSH' (case-insensitive)
+    """
+    result = outcome.upper()
+    if result not in ('WIN', 'LOSS', 'PUSH'):
+        logger.warning(f"Unknown outcome for {bet_id}: {outcome}")
+        return False
+    
+    for bet in bets:
+        if bet.event_id == bet_id and bet.status in OPEN_OR_PENDING:
+            settle_pick(bet, result)
+            logger.info(f"✓ Manually graded: {bet.sport} {bet.pick} = {result} (${bet.profit:+.2f})")
+            return True
+    
+    logger.warning(f"No open or pending bet found for {bet_id}")
+    return False
+
+def scan_open_bets(bets: List[Pick]) -> Tuple[set, int]:
+    """Event IDs of all open or pending bets, and how many such bets there are (one pass)"""
+    event_ids = set()
+    open_count = 0
+    for bet in bets:
+        if bet.status in OPEN_OR_PENDING:
+            event_ids.add(bet.event_id)
+            open_count += 1
+    return event_ids, open_count
+
+def auto_place_picks(new_picks: List[Pick], existing_bets: List[Pick],
+                     open_bets: Optional[Tuple[set, int]] = None) -> List[Pick]:
     """
     Auto-place top picks (up to MAX_PICKS)
     Merge with existing bets, avoiding duplicates
+    open_bets is scan_open_bets(existing_bets) if the caller already has it
     """
-    # Get existing event IDs to avoid duplicates
-    existing_event_ids = {bet.event_id for bet in existing_bets if bet.status in ['open', 'pending']}
+    # Active event IDs (to avoid duplicates) and how many bets are still open
+    if open_bets is None:
+        open_bets = scan_open_bets(existing_bets)
+    existing_event_ids, current_open_count = open_bets
     
     # Filter out picks for games we already bet on
     available_picks = [p for p in new_picks if p.event_id not in existing_event_ids]
     
     # Calculate how many new picks we can add
-    current_open_count = len([b for b in existing_bets if b.status in ['open', 'pending']])
     slots_available = MAX_PICKS - current_open_count
     
     if slots_available <= 0:
         logger.info(f"Already at max picks ({MAX_PICKS}), no new picks placed")
         return existing_bets
     
-    # Take top picks by EV up to available slots
-    picks_to_place = sorted(available_picks, key=lambda p: p.ev, reverse=True)[:slots_available]
+    # Take top picks by EV up to available slots (no full sort needed)
+    picks_to_place = heapq.nlargest(slots_available, available_picks, key=attrgetter('ev'))
     
     logger.info(f"✓ Auto-placing {len(picks_to_place)} new picks (max: {MAX_PICKS}, available slots: {slots_available})")
     
@@ -808,6 +1000,98 @@ def auto_place_picks(new_picks: List[Pick], existing_bets: List[Pick]) -> List[P
     all_bets = existing_bets + picks_to_place
     return all_bets
 
+# ============================================================================
+# PERFORMANCE TRACKING
+# ============================================================================
+
+BET_TYPE_NAMES = {'h2h': 'Moneyline', 'spreads': 'Spread', 'totals': 'Total'}
+
+def _empty_tally() -> Dict:
+    """Running counters for one performance group"""
+    return {'bets': 0, 'wins': 0, 'losses': 0, 'pushes': 0, 'wagered': 0.0, 'profit': 0.0}
+
+def _group_summary(tally: Dict) -> Dict:
+    """Convert a group tally to the by_sport / by_bet_type output shape"""
+    decisive = tally['wins'] + tally['losses']
+    return {
+        'bets': tally['bets'],
+        'wins': tally['wins'],
+        'losses': tally['losses'],
+        'win_rate': round(tally['wins'] / decisive, 3) if decisive > 0 else 0.0,
+        'roi': round(tally['profit'] / tally['wagered'], 3) if tally['wagered'] > 0 else 0.0,
+        'profit': round(tally['profit'], 2)
+    }
+
+def calculate_performance(picks: List[Pick]) -> Dict:
+    """Calculate performance metrics from graded picks (single pass over picks)"""
+    totals = _empty_tally()
+    sport_tallies = {}
+    type_tallies = {}
+    
+    for p in picks:
+        if p.status != 'graded' or not p.result:
+            continue
+        
+        sport_tally = sport_tallies.get(p.sport)
+        if sport_tally is None:
+            sport_tally = sport_tallies[p.sport] = _empty_tally()
+        type_tally = type_tallies.get(p.pick_type)
+        if type_tally is None:
+            type_tally = type_tallies[p.pick_type] = _empty_tally()
+        
+        profit = p.profit if p.profit is not None else 0.0
+        for tally in (totals, sport_tally, type_tally):
+            tally['bets'] += 1
+            tally['wagered'] += p.stake
+            tally['profit'] += profit
+            if p.result == 'WIN':
+                tally['wins'] += 1
+            elif p.result == 'LOSS':
+                tally['losses'] += 1
+            elif p.result == 'PUSH':
+                tally['pushes'] += 1
+    
+    # Calculate win rate (excluding pushes) and ROI
+    decisive_bets = totals['wins'] + totals['losses']
+    win_rate = totals['wins'] / decisive_bets if decisive_bets > 0 else 0.0
+    roi = (totals['profit'] / totals['wagered']) if totals['wagered'] > 0 else 0.0
+    
+    overall = {
+        'total_bets': totals['bets'],
+        'wins': totals['wins'],
+        'losses': totals['losses'],
+        'pushes': totals['pushes'],
+        'win_rate': round(win_rate, 3),
+        'roi': round(roi, 3),
+        'total_wagered': round(totals['wagered'], 2),
+        'total_profit': round(totals['profit'], 2)
+    }
+    
+    by_sport = {sport: _group_summary(tally) for sport, tally in sport_tallies.items()}
+    by_bet_type = {
+        BET_TYPE_NAMES.get(bet_type, bet_type): _group_summary(tally)
+        for bet_type, tally in type_tallies.items()
+    }
+    
+    return {
+        'overall': overall,
+        'by_sport': by_sport,
+        'by_bet_type': by_bet_type
+    }
+
+def save_performance(performance: Dict):
+    """Save performance metrics to JSON file"""
+    data = {
+        'last_updated': datetime.now().isoformat(),
+        'performance': performance
+    }
+    
+    try:
+        write_json(PERFORMANCE_FILE, data)
+        logger.info(f"✓ Saved performance metrics to {PERFORMANCE_FILE}")
+    except Exception as e:
+        logger.error(f"Error saving performance: {e}")
+
 # ============================================================================
 # JSON OUTPUT GENERATION
 # ============================================================================
@@ -818,12 +1102,25 @@ def generate_data_json(picks_by_sport: Dict[str, List[Pick]],
     """Generate data.json for frontend"""
     
     # Calculate current bankroll from performance
-    current_bankroll = calculate_current_bankroll(config)
-    
-    # Count bets by status
-    open_count = len([b for b in all_bets if b.status == 'open'])
-    pending_count = len([b for b in all_bets if b.status == 'pending'])
-    graded_count = len([b for b in all_bets if b.status == 'graded'])
+    current_bankroll = calculate_current_bankroll(config, all_bets)
+    
+    # Bucket bets by status in a single pass; counts are the bucket sizes.
+    # Each bet is serialized once and reused by the parlay and pick cards.
+    placed_bets = {'open': [], 'pending': [], 'graded': []}
+    serialized = {}  # id(pick) -> pick_to_dict(pick)
+    for b in all_bets:
+        bucket = placed_bets.get(b.status)
+        if bucket is not None:
+            bet_dict = serialized[id(b)] = pick_to_dict(b)
+            bucket.append(bet_dict)
+    
+    def to_dict(pick: Pick) -> Dict:
+        bet_dict = serialized.get(id(pick))
+        return bet_dict if bet_dict is not None else pick_to_dict(pick)
+    
+    open_count = len(placed_bets['open'])
+    pending_count = len(placed_bets['pending'])
+    graded_count = len(placed_bets['graded'])
     
     data = {
         'generated_at': datetime.now().isoformat(),
@@ -837,28 +1134,23 @@ def generate_data_json(picks_by_sport: Dict[str, List[Pick]],
             'legs': len(parlay),
             'total_stake': sum(p.stake for p in parlay),
             'total_ev': sum(p.ev for p in parlay),
-            'picks': [pick_to_dict(p) for p in parlay]
+            'picks': [to_dict(p) for p in parlay]
         },
-        'placed_bets': {
-            'open': [pick_to_dict(b) for b in all_bets if b.status == 'open'],
-            'pending': [pick_to_dict(b) for b in all_bets if b.status == 'pending'],
-            'graded': [pick_to_dict(b) for b in all_bets if b.status == 'graded']
-        }
+        'placed_bets': placed_bets
     }
     
     # Add sport-specific cards (only open picks for display)
     for sport, picks in picks_by_sport.items():
         if picks:
-            data['pick_cards'][sport.lower()] = [pick_to_dict(p) for p in picks[:10]]
+            data['pick_cards'][sport.lower()] = [to_dict(p) for p in picks[:10]]
     
-    with open(DATA_OUTPUT, 'w') as f:
-        json.dump(data, f, indent=2)
+    write_json(DATA_OUTPUT, data)
     
     logger.info(f"✓ Generated {DATA_OUTPUT}")
     logger.info(f"  Open: {open_count}, Pending: {pending_count}, Graded: {graded_count}")
 
 
-def generate_scores_json(config: Config):
+def generate_scores_json(config: Config, scores_cache: Optional[Dict[str, List[Dict]]] = None):
     """Generate scores.json payload for the live ticker.
 
     We emit two parallel views:
@@ -868,18 +1160,16 @@ def generate_scores_json(config: Config):
     all_games = []
     flat_scores = []
 
-    for sport_key in config.sports:
+    for sport_key, scores in fetch_all_scores(config, scores_cache).items():
         sport_name = SPORT_NAMES.get(sport_key, sport_key)
-        scores = fetch_scores(sport_key, config.api_key)
-        if not scores:
-            continue
 
         for game in scores:
             home_team = game.get("home_team", "") or ""
             away_team = game.get("away_team", "") or ""
 
-            home_score = get_team_score(game, home_team)
-            away_score = get_team_score(game, away_team)
+            team_scores = get_team_scores(game)
+            home_score = team_scores.get(home_team)
+            away_score = team_scores.get(away_team)
 
             # Basic status classification
             if game.get("completed"):
@@ -926,20 +1216,16 @@ def generate_scores_json(config: Config):
         "scores": flat_scores,
     }
 
-    with open(SCORES_OUTPUT, "w") as f:
-        json.dump(payload, f, indent=2)
+    write_json(SCORES_OUTPUT, payload)
 
     logger.info(f"✓ Generated {SCORES_OUTPUT} ({len(all_games)} games)")
-def get_team_score(game: Dict, team: str) -> Optional[int]:
-    """Extract team score from game data"""
+def get_team_scores(game: Dict) -> Dict[str, Optional[str]]:
+    """Map team name -> score from game data (empty if no scores yet)"""
     scores = game.get('scores')
     if not scores:
-        return None
+        return {}
     
-    for score in scores:
-        if score.get('name') == team:
-            return score.get('score')
-    return None
+    return {score.get('name'): score.get('score') for score in scores}
 
 def pick_to_dict(pick: Pick) -> Dict:
     """Convert Pick to dictionary for JSON"""
@@ -963,15 +1249,13 @@ def count_open_bets(picks_by_sport: Dict[str, List[Pick]]) -> int:
     """Count total open bets"""
     count = 0
     for picks in picks_by_sport.values():
-        count += sum(1 for p in picks if p.status in ['open', 'pending'])
+        count += sum(1 for p in picks if p.status in OPEN_OR_PENDING)
     return count
 
-def calculate_current_bankroll(config: Config) -> float:
-    """Calculate current bankroll from placed bets"""
-    placed_bets = load_placed_bets()
-    
+def calculate_current_bankroll(config: Config, bets: List[Pick]) -> float:
+    """Calculate current bankroll from the in-memory list of placed bets"""
     total_profit = sum(
-        p.profit for p in placed_bets 
+        p.profit for p in bets 
         if p.status == 'graded' and p.profit is not None
     )
     
@@ -983,6 +1267,92 @@ def calculate_current_bankroll(config: Config) -> float:
 # MAIN EXECUTION
 # ============================================================================
 
+def rebuild_data_json(config: Config):
+    """
+    Run the full pipeline: fetch odds, place and grade picks, and
+    regenerate data.json, scores.json, placed_bets.json and performance.json
+    """
+    # 1. Load existing placed bets
+    logger.info("Loading existing placed bets...")
+    placed_bets = load_placed_bets()
+    
+    # 2. Fetch odds from API, unless every pick slot is already taken
+    active_ids, open_count = scan_open_bets(placed_bets)
+    if open_count >= MAX_PICKS:
+        logger.info(f"Already at max picks ({MAX_PICKS}), skipping odds fetch")
+        all_bets = placed_bets
+    else:
+        logger.info("Fetching odds from API...")
+        odds_data = fetch_all_odds(config)
+        
+        if not odds_data:
+            # Still grade and regenerate outputs; only new picks are skipped
+            logger.warning("No odds data fetched, no new picks placed")
+            all_bets = placed_bets
+        else:
+            # 3. Generate new candidate picks (skipping games we already have a bet on)
+            logger.info("Generating picks...")
+            new_picks = generate_picks(odds_data, config, active_ids)
+            
+            # 4. Deduplicate (prevent both sides of same game)
+            new_picks = deduplicate_picks(new_picks)
+            
+            # 5. Auto-place top picks (up to MAX_PICKS total)
+            logger.info(f"Auto-placing picks (max: {MAX_PICKS})...")
+            all_bets = auto_place_picks(new_picks, placed_bets, (active_ids, open_count))
+    
+    # 6. Grade pending bets
+    logger.info("Grading pending bets...")
+    scores_cache = {}  # scores fetched once per run, shared with scores.json
+    statuses_before = [b.status for b in all_bets]
+    all_bets = grade_picks(all_bets, config, scores_cache)
+    
+    # 7. Save placed bets, only if picks were placed or a bet changed status
+    #    (grading sets result/profit together with the status)
+    bets_changed = len(all_bets) != len(placed_bets) or any(
+        b.status != status for b, status in zip(all_bets, statuses_before)
+    )
+    if bets_changed:
+        save_placed_bets(all_bets)
+    else:
+        logger.info(f"No new or graded bets, leaving {PLACED_BETS_FILE} unchanged")
+    
+    # 8. Calculate performance metrics
+    logger.info("Calculating performance...")
+    performance = calculate_performance(all_bets)
+    save_performance(performance)
+    
+    # 9. Organize open picks by sport for display (one pass also tallies
+    #    statuses for the summary)
+    open_picks = []
+    status_counts = Counter()
+    for b in all_bets:
+        status_counts[b.status] += 1
+        if b.status == 'open':
+            open_picks.append(b)
+    picks_by_sport = sort_picks_by_sport(open_picks)
+    
+    # 10. Build parlay from the same open picks
+    parlay = build_parlay(open_picks, config.parlay_legs)
+    
+    # 11. Generate outputs
+    logger.info("Generating output files...")
+    generate_data_json(picks_by_sport, parlay, all_bets, config, performance)
+    generate_scores_json(config, scores_cache)
+    
+    # 12. Summary
+    logger.info("=" * 60)
+    logger.info(f"✓ SmartPicks Complete")
+    logger.info(f"  Total Placed Bets: {len(all_bets)}")
+    logger.info(f"  Open: {status_counts['open']}")
+    logger.info(f"  Pending: {status_counts['pending']}")
+    logger.info(f"  Graded: {status_counts['graded']}")
+    logger.info(f"  Parlay Legs: {len(parlay)}")
+    logger.info(f"  Bankroll: ${calculate_current_bankroll(config, all_bets):.2f}")
+    logger.info(f"  Win Rate: {performance['overall']['win_rate']:.1%}")
+    logger.info(f"  ROI: {performance['overall']['roi']:.1%}")
+    logger.info("=" * 60)
+
 def main():
     """Main execution flow"""
     parser = argparse.ArgumentParser(description='SmartPicks Sports Betting Engine')
@@ -997,72 +1367,12 @@ def main():
     logger.info("=" * 60)
     
     try:
-        # 1. Load configuration
         config = load_config()
-        
-        # 2. Load existing placed bets
-        logger.info("Loading existing placed bets...")
-        placed_bets = load_placed_bets()
-        
-        # 3. Fetch odds from API
-        logger.info("Fetching odds from API...")
-        odds_data = fetch_all_odds(config)
-        
-        if not odds_data:
-            logger.error("No odds data fetched. Exiting.")
-            return
-        
-        # 4. Generate new candidate picks
-        logger.info("Generating picks...")
-        new_picks = generate_picks(odds_data, config)
-        
-        # 5. Deduplicate (prevent both sides of same game)
-        new_picks = deduplicate_picks(new_picks)
-        
-        # 6. Auto-place top picks (up to MAX_PICKS total)
-        logger.info(f"Auto-placing picks (max: {MAX_PICKS})...")
-        all_bets = auto_place_picks(new_picks, placed_bets)
-        
-        # 7. Grade pending bets
-        logger.info("Grading pending bets...")
-        all_bets = grade_picks(all_bets, config)
-        
-        # 8. Save placed bets
-        save_placed_bets(all_bets)
-        
-        # 9. Calculate performance metrics
-        logger.info("Calculating performance...")
-        performance = calculate_performance(all_bets)
-        save_performance(performance)
-        
-        # 10. Organize by sport for display
-        picks_by_sport = sort_picks_by_sport([b for b in all_bets if b.status == 'open'])
-        
-        # 11. Build parlay from open picks
-        open_picks = [p for p in all_bets if p.status == 'open']
-        parlay = build_parlay(open_picks, config.parlay_legs)
-        
-        # 12. Generate outputs
-        logger.info("Generating output files...")
-        generate_data_json(picks_by_sport, parlay, all_bets, config, performance)
-        generate_scores_json(config)
-        
-        # 13. Summary
-        logger.info("=" * 60)
-        logger.info(f"✓ SmartPicks Complete")
-        logger.info(f"  Total Placed Bets: {len(all_bets)}")
-        logger.info(f"  Open: {len([b for b in all_bets if b.status == 'open'])}")
-        logger.info(f"  Pending: {len([b for b in all_bets if b.status == 'pending'])}")
-        logger.info(f"  Graded: {len([b for b in all_bets if b.status == 'graded'])}")
-        logger.info(f"  Parlay Legs: {len(parlay)}")
-        logger.info(f"  Bankroll: ${calculate_current_bankroll(config):.2f}")
-        logger.info(f"  Win Rate: {performance['overall']['win_rate']:.1%}")
-        logger.info(f"  ROI: {performance['overall']['roi']:.1%}")
-        logger.info("=" * 60)
+        rebuild_data_json(config)
     
     except Exception as e:
         logger.error(f"Fatal error: {e}", exc_info=args.debug)
         raise
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()